@@ -1,6 +1,10 @@
+import micropython
 from machine import ADC, Pin, PWM
 from servo_translator import translate
 
+# scale factor from a read_u16() sample to the range 0.0 - 1.0
+INV_U16_MAX = 1.0 / 65535.0
+
 class PotentiometerState:
     """
     Handles periodically reading from the potentiometers and caching the values.
@@ -24,18 +28,16 @@ class PotentiometerState:
         self.pot_poll_interval = pot_poll_interval
         self.timer = 0
 
+    @micropython.native
     def _read(self):
         """
         Read the values from the potentiometers and update the internal state.
         """
 
-        # read the values and convert them to floats
-        x = self.pot_x.read_u16() / 65535.0
-        y = self.pot_y.read_u16() / 65535.0
-
-        # clamp the x and y to 0.0 - 1.0 (just in case)
-        self.x_value = 0. if x < 0. else 1. if x > 1. else x
-        self.y_value = 0. if y < 0. else 1. if y > 1. else y
+        # read the values and convert them to floats. read_u16() is always
+        # in 0 - 65535, so the result is already in 0.0 - 1.0 without clamping
+        self.x_value = self.pot_x.read_u16() * INV_U16_MAX
+        self.y_value = self.pot_y.read_u16() * INV_U16_MAX
 
     def get(self) -> 'tuple[float, float]':
         """
@@ -43,6 +45,7 @@ class PotentiometerState:
         """
         return self.x_value, self.y_value
 
+    @micropython.native
     def update(self, elapsed_time: float):
         self.timer += elapsed_time
 
@@ -53,6 +56,10 @@ class PotentiometerState:
 class ButtonState:
     """
     Handles reading from and debouncing a button and caches the button's toggle state.
+
+    The debounce is deferred: a new pin value is only accepted once the pin has
+    not changed for the debounce time, so a single bounce does not restart a
+    lockout period like a press-triggered debounce would.
     """
     _btn: Pin
     _btn_debounce: float
@@ -60,15 +67,19 @@ class ButtonState:
     _elapsed_time: float
 
     _toggled_on: bool
+    _just_pressed: bool
 
-    _btn_last_pressed: bool
+    _btn_last_raw: bool
+    _btn_stable: bool
 
     def __init__(self, btn_pin: int, btn_debounce: float):
         self._btn = Pin(btn_pin)
         self._btn_debounce = btn_debounce
         self._elapsed_time = 0
         self._toggled_on = False
-        self._btn_last_pressed = False
+        self._just_pressed = False
+        self._btn_last_raw = False
+        self._btn_stable = False
 
     def get(self) -> bool:
         """
@@ -76,33 +87,53 @@ class ButtonState:
         """
         return self._toggled_on
 
+    def just_pressed(self) -> bool:
+        """
+        Retrieve whether the button was pressed during the last update.
+        """
+        return self._just_pressed
+
+    @micropython.native
     def update(self, elapsed_time: float) -> None:
         """
         Update the state with the elapsed time.
         """
         self._elapsed_time += elapsed_time
+        self._just_pressed = False
 
-        # get the button's current pressed state
-        btn_pressed = self._btn.value()
+        # get the button's current raw pressed state
+        btn_raw = self._btn.value()
 
-        # debounce 
-        if btn_pressed and not self._btn_last_pressed \
-                and self._elapsed_time >= self._btn_debounce:
+        # debounce: restart the timer on any change of the raw value and only
+        # accept it as the new stable value once it has settled
+        if btn_raw != self._btn_last_raw:
             self._elapsed_time = 0
-            self._toggled_on = not self._toggled_on
-        
-        self._btn_last_pressed = btn_pressed
+            self._btn_last_raw = btn_raw
+        elif btn_raw != self._btn_stable and self._elapsed_time >= self._btn_debounce:
+            self._btn_stable = btn_raw
+
+            if btn_raw:
+                self._just_pressed = True
+                self._toggled_on = not self._toggled_on
 
 class ArmController:
     shoulder: PWM
     elbow: PWM
     wrist: PWM
 
+    _last_shoulder_duty: int
+    _last_elbow_duty: int
+
     def __init__(self, shoulder_pin: int, elbow_pin: int, wrist_pin: int):
         self.shoulder = PWM(Pin(shoulder_pin), freq=50)
         self.elbow = PWM(Pin(elbow_pin), freq=50)
         self.wrist = PWM(Pin(wrist_pin), freq=50)
 
+        # the duty cycles last written to the servos, -1 if none yet
+        self._last_shoulder_duty = -1
+        self._last_elbow_duty = -1
+
+    @micropython.native
     def set_arm_angles(self, alpha: float, beta:float) -> None:
         """
         Move the arm to a specific position
@@ -113,8 +144,14 @@ class ArmController:
         shoulder_duty_cycle = translate(shoulder_angle)
         elbow_duty_cycle = translate(elbow_angle)
 
-        self.shoulder.duty_u16(shoulder_duty_cycle)
-        self.elbow.duty_u16(elbow_duty_cycle)
+        # only write to the PWM when the duty cycle actually changes
+        if shoulder_duty_cycle != self._last_shoulder_duty:
+            self.shoulder.duty_u16(shoulder_duty_cycle)
+            self._last_shoulder_duty = shoulder_duty_cycle
+
+        if elbow_duty_cycle != self._last_elbow_duty:
+            self.elbow.duty_u16(elbow_duty_cycle)
+            self._last_elbow_duty = elbow_duty_cycle
 
     def move_wrist(self, pen_down: bool) -> None:
         """
@@ -0,0 +1,43 @@
+import micropython
+from math import pi, sqrt
+
+QUARTER_PI = pi / 4
+THREE_QUARTER_PI = 3 * pi / 4
+
+@micropython.native
+def fast_acos(x: float) -> float:
+    """
+    Approximates acos(x) in radians for x in [-1, 1] with a polynomial
+    (Abramowitz & Stegun 4.4.45, absolute error <= 6.7e-5 rad).
+
+    Like math.acos, raises ValueError if x is outside of [-1, 1].
+    """
+    negate = x < 0
+    if negate:
+        x = -x
+
+    # sqrt(1 - x) * (a0 + a1*x + a2*x^2 + a3*x^3), evaluated with Horner's method
+    result = sqrt(1 - x) * (1.5707288 + x * (-0.2121144 + x * (0.0742610 - x * 0.0187293)))
+
+    # acos(-x) = pi - acos(x)
+    return pi - result if negate else result
+
+@micropython.native
+def fast_atan2(y: float, x: float) -> float:
+    """
+    Approximates atan2(y, x) in radians with the self-normalizing polynomial
+    from dspguru (absolute error <= 0.0102 rad).
+    """
+    # keep abs_y non-zero to avoid dividing by zero at the origin
+    abs_y = abs(y) + 1e-10
+
+    if x >= 0:
+        r = (x - abs_y) / (x + abs_y)
+        angle = QUARTER_PI
+    else:
+        r = (x + abs_y) / (abs_y - x)
+        angle = THREE_QUARTER_PI
+
+    angle += (0.1963 * r * r - 0.9817) * r
+
+    return -angle if y < 0 else angle
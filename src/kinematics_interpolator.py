@@ -0,0 +1,131 @@
+import micropython
+from array import array
+
+class GridInterpolator:
+    """
+    Approximates the inverse kinematics over the board by bilinear interpolation
+    of (alpha, beta) solutions precomputed on a regular grid.
+    """
+    _width: float
+    _height: float
+
+    _nx: int
+    _ny: int
+
+    _inv_cell_width: float
+    _inv_cell_height: float
+
+    # the grid samples, stored column by column (index ix * ny + iy); NaN
+    # where the arm can't reach
+    _alpha: array
+    _beta: array
+
+    # the index of the last cell looked up and its corner samples, since
+    # consecutive lookups usually land in the same cell
+    _cached_cell: int
+    _cached_corners: 'tuple[float, float, float, float, float, float, float, float] | None'
+
+    def __init__(self, solve, width: float, height: float, nx: int, ny: int):
+        """
+        Sample solve(x, y) on an nx by ny grid of points spanning
+        [0, width] x [0, height].
+        """
+        self._width = width
+        self._height = height
+
+        self._nx = nx
+        self._ny = ny
+
+        cell_width = width / (nx - 1)
+        cell_height = height / (ny - 1)
+        self._inv_cell_width = 1 / cell_width
+        self._inv_cell_height = 1 / cell_height
+
+        self._cached_cell = -1
+        self._cached_corners = None
+
+        nan = float('nan')
+        self._alpha = array('f')
+        self._beta = array('f')
+
+        for ix in range(nx):
+            x = ix * cell_width
+            for iy in range(ny):
+                solution = solve(x, iy * cell_height)
+
+                if solution is None:
+                    self._alpha.append(nan)
+                    self._beta.append(nan)
+                else:
+                    self._alpha.append(solution[0])
+                    self._beta.append(solution[1])
+
+    @micropython.native
+    def get_angles(self, x: float, y: float) -> 'tuple[float, float] | None':
+        """
+        Get the interpolated (alpha, beta) in degrees for the given board position.
+        Returns None if the position is outside of the grid or next to a point
+        the arm can't reach.
+        """
+        if x < 0 or y < 0 or x > self._width or y > self._height:
+            return None
+
+        nx = self._nx
+        ny = self._ny
+
+        # position in grid cells
+        gx = x * self._inv_cell_width
+        gy = y * self._inv_cell_height
+
+        # gx and gy are non-negative, so int() truncation is floor()
+        ix = int(gx)
+        iy = int(gy)
+
+        # points on the far edges belong to the last cell
+        if ix >= nx - 1:
+            ix = nx - 2
+        if iy >= ny - 1:
+            iy = ny - 2
+
+        u = gx - ix
+        v = gy - iy
+
+        # corners of the cell
+        i00 = ix * ny + iy
+
+        if i00 == self._cached_cell:
+            a00, a10, a01, a11, b00, b10, b01, b11 = self._cached_corners
+        else:
+            alpha = self._alpha
+            i10 = i00 + ny
+
+            a00 = alpha[i00]
+            a01 = alpha[i00 + 1]
+            a10 = alpha[i10]
+            a11 = alpha[i10 + 1]
+
+            # NaN is the only value not equal to itself
+            if a00 != a00 or a01 != a01 or a10 != a10 or a11 != a11:
+                return None
+
+            beta = self._beta
+            b00 = beta[i00]
+            b01 = beta[i00 + 1]
+            b10 = beta[i10]
+            b11 = beta[i10 + 1]
+
+            self._cached_cell = i00
+            self._cached_corners = (a00, a10, a01, a11, b00, b10, b01, b11)
+
+        # bilinear weights of the corners, shared by both angles
+        one_minus_u = 1 - u
+        one_minus_v = 1 - v
+        w00 = one_minus_u * one_minus_v
+        w10 = u * one_minus_v
+        w01 = one_minus_u * v
+        w11 = u * v
+
+        return (
+            w00 * a00 + w10 * a10 + w01 * a01 + w11 * a11,
+            w00 * b00 + w10 * b10 + w01 * b01 + w11 * b11,
+        )
@@ -1,9 +1,18 @@
-import math
-from time import time_ns, sleep_ms
+import micropython
+from math import sqrt, atan2, degrees, inf, pi
+from time import ticks_ms, ticks_diff, sleep_ms
 
 from boardio import PotentiometerState, ButtonState, ArmController
+from kinematics_interpolator import GridInterpolator
 
 # Configuration
+
+# the period of the main loop in ms
+loop_interval = 10
+
+# print the target and pen state every iteration (slows down the loop)
+debug = False
+
 pot_pin_x = 27
 pot_pin_y = 26
 pot_poll_interval = 50
@@ -12,53 +21,101 @@ pot_poll_interval = 50
 btn_pin = 12
 
 # the time in ms to debounce btn
-btn_debounce = 50.
+btn_debounce = 10.
 
 # pins for PWM output to arm
 shoulder_pin = 0
 elbow_pin = 1
 wrist_pin = 2
 
+# the size of the drawing area on the board in mm
+board_width = 215.
+board_height = 279.4
+
+# the distance in mm the target has to move before the inverse kinematics
+# are solved again (about 0.1 degrees of shoulder motion, below what the
+# servos can resolve)
+ik_resolve_distance = 0.27
+
+# the number of points per axis of the precomputed inverse kinematics grid
+ik_grid_size = 64
+
+# arm geometry in mm: the shoulder position on the board and the link lengths
+arm_base_x = -25.4
+arm_base_y = 139.5
+shoulder_length = 155.
+elbow_length = 155.
+
+# terms of the law of cosines that only depend on the arm geometry,
+# precomputed so solve_kinematics doesn't redo them every iteration
+LA_SQ_PLUS_LB_SQ = shoulder_length * shoulder_length + elbow_length * elbow_length
+INV_TWO_LA_LB = 1 / (2 * shoulder_length * elbow_length)
+TWO_PI = 2 * pi
+
+# squared bounds on the shoulder to target distance for the target to be reachable
+REACH_MAX_SQ = (shoulder_length + elbow_length) * (shoulder_length + elbow_length)
+REACH_MIN_SQ = (shoulder_length - elbow_length) * (shoulder_length - elbow_length)
+
+# use the polynomial approximations from fast_trig in solve_kinematics instead
+# of the libm functions (set to False to validate against the exact versions)
+use_fast_trig = True
+
+if use_fast_trig:
+    from fast_trig import fast_acos as acos
+else:
+    from math import acos
+
+@micropython.native
 def solve_kinematics(
     Cx: float, Cy: float,
-    Ax: float = -25.4, Ay: float = 139.5,
-    La: float = 155, Lb: float = 155
+    _sqrt=sqrt, _acos=acos, _atan2=atan2, _degrees=degrees
     ) -> 'tuple[float, float] | None':
     """
     Get a solution of (alpha, beta) in degrees to move the arm to the specified position.
     Returns None if there is no solution.
+
+    The math functions are bound as default arguments so they are looked up
+    as locals rather than globals; they are not meant to be passed.
     """
+    # vector from the shoulder (A) to the target (C), with dy pointing down
+    # the vertical through the shoulder
+    dx = abs(Cx - arm_base_x)
+    dy = arm_base_y - Cy
+    AC_sq = dx*dx + dy*dy
+
+    # reject unreachable targets before doing any trig
+    if AC_sq > REACH_MAX_SQ or AC_sq < REACH_MIN_SQ:
+        return None
+
+    # the elbow angle is the exterior angle at B, i.e. pi - angle_ABC, so by
+    # the law of cosines cos(beta) = (AC^2 - La^2 - Lb^2) / (2 La Lb)
+    cos_beta = (AC_sq - LA_SQ_PLUS_LB_SQ) * INV_TWO_LA_LB
+
     try:
-        AC = math.sqrt(
-            (Ax - Cx)**2 + (Ay - Cy)**2
-        )
-        AbaseC = math.sqrt(
-            (Ax - Cx)**2 + Cy**2
-        )
-        angle_BAC = math.acos(
-            (La**2 + AC**2 - Lb**2) / (2 * La * AC)
-        )
-        angle_ACB = math.asin(
-            (La * math.sin(angle_BAC)) / Lb
-        )
-        angle_YAC = math.acos(
-            (Ay**2 + AC**2 - AbaseC**2) / (2 * Ay * AC)
-        )
+        angle_beta = _acos(cos_beta)
+        sin_beta = _sqrt(1 - cos_beta*cos_beta)
     except ValueError:
+        # only reachable through rounding right at the reach limits
         return None
 
+    # the shoulder angle is angle_YAC (between the vertical and AC) plus
+    # angle_BAC (between AC and the upper arm). Rotating (dy, dx) by
+    # angle_BAC = atan2(Lb sin(beta), La + Lb cos(beta)) gives their sum
+    # with a single atan2
+    k1 = shoulder_length + elbow_length * cos_beta
+    k2 = elbow_length * sin_beta
+    angle_alpha = _atan2(dx*k1 + dy*k2, dy*k1 - dx*k2)
+
+    # both angles are in [0, pi], so map the sum back out of atan2's (-pi, pi]
+    if angle_alpha < 0:
+        angle_alpha += TWO_PI
+
     # in degrees
-    alpha = math.degrees(angle_BAC + angle_YAC)
-    beta = math.degrees(angle_BAC + angle_ACB)
+    alpha = _degrees(angle_alpha)
+    beta = _degrees(angle_beta)
 
     return (alpha, beta)
 
-def convert_board_coordinates(x: float, y: float) -> 'tuple[float, float]':
-    """
-    Convert the given [0 - 1] x, y coordinates into coordinates on the board.
-    """
-    return (x * 215, y * 279.4)
-
 def get_actual_angles(arm: 'ArmController') -> 'tuple[float, float]':
     """
     Read the actual angles from the arm and return them.
@@ -73,11 +130,30 @@ def main():
     button_state = ButtonState(btn_pin, btn_debounce)
     arm_controller = ArmController(shoulder_pin=shoulder_pin, elbow_pin=elbow_pin, wrist_pin=wrist_pin)
 
-    start = time_ns()
+    # precompute the inverse kinematics over the board once at boot
+    interpolator = GridInterpolator(
+        solve_kinematics, board_width, board_height, ik_grid_size, ik_grid_size
+    )
+
+    # the last target the inverse kinematics were solved for and its solution
+    last_board_x, last_board_y = -inf, -inf
+    alpha, beta = 0., 0.
+
+    # bind the functions and settings used in the loop to locals, which are
+    # faster to look up than globals on MicroPython
+    solve = solve_kinematics
+    get_angles = interpolator.get_angles
+    width, height = board_width, board_height
+    get_ticks, diff_ticks, sleep = ticks_ms, ticks_diff, sleep_ms
+    resolve_distance_sq = ik_resolve_distance * ik_resolve_distance
+    interval = loop_interval
+    print_state = debug
+
+    start = get_ticks()
     while True:
         # update time 
-        end = time_ns()
-        elapsed = (end - start) / 1_000_000
+        end = get_ticks()
+        elapsed = diff_ticks(end, start)
         start = end
 
         # update the handlers with the elapsed time
@@ -89,26 +165,42 @@ def main():
         pen_down = button_state.get()
 
 
-        # convert x, y to board coordinates for the arm
-        board_x, board_y = convert_board_coordinates(x, y)
+        # convert the [0 - 1] x, y to coordinates on the board for the arm
+        board_x = x * width
+        board_y = y * height
 
-        # solve the inverse kinematics equations
-        kinematics_solution = solve_kinematics(board_x, board_y)
+        # look up the inverse kinematics solution, reusing the last one
+        # while the target has not moved (e.g. holding the pen still)
+        move_x = board_x - last_board_x
+        move_y = board_y - last_board_y
+        if move_x*move_x + move_y*move_y >= resolve_distance_sq:
+            kinematics_solution = get_angles(board_x, board_y)
 
-        if kinematics_solution is None:
-            # handle this
-            raise NotImplementedError()
-            continue
-        
-        alpha, beta = kinematics_solution
+            # fall back to solving directly outside of the grid
+            if kinematics_solution is None:
+                kinematics_solution = solve(board_x, board_y)
+
+            if kinematics_solution is None:
+                # handle this
+                raise NotImplementedError()
+                continue
+
+            alpha, beta = kinematics_solution
+            last_board_x, last_board_y = board_x, board_y
         
         arm_controller.set_arm_angles(alpha, beta)
 
         # arm_controller.set_wrist_down(pen_down)
 
         # error_shoulder, error_arm = get_actual_angles(arm_controller)
-        print(board_x, board_y, f"x: {board_x:.4f}, y: {board_y:.4f}, pen: {'down' if pen_down else 'up'}")
-        sleep_ms(50)
+        if print_state:
+            print("x: %.4f, y: %.4f, pen: %s" % (board_x, board_y, 'down' if pen_down else 'up'))
+
+        # sleep for the rest of the loop interval, so the time spent in the
+        # loop body doesn't add to the period
+        remaining = interval - diff_ticks(get_ticks(), start)
+        if remaining > 0:
+            sleep(remaining)
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,7 @@
+MIN = 1638 # 0 degrees
+MAX = 8192 # 180 degrees
+DEG = (MAX - MIN) / 180 # value per degree
+
 def translate(angle: float) -> int:
 	"""
 	Converts an angle in degrees to the corresponding input
@@ -7,10 +11,6 @@ def translate(angle: float) -> int:
 	details on the duty_u16 method
 	"""
 
-	MIN = 1638 # 0 degrees
-	MAX = 8192 # 180 degrees
-	DEG = (MAX - MIN) / 180 # value per degree
-
 	# clamp angle to be between 0 and 180
 	angle = max(0, min(180, angle))
 